@@ -1,20 +1,110 @@
 #!/usr/bin/env python3
 import json
-import boto3
 import argparse
+import hashlib
 import os
 import logging
+import logging.handlers
+import queue
+import stat
 import sys
-from botocore.exceptions import ClientError
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-# Set up logging
+# orjson is considerably faster for both parsing and serializing; fall back to
+# the standard library when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Set up logging (timestamps are left to the CI log itself)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format='%(levelname)s %(message)s',
     handlers=[logging.StreamHandler()]
 )
 logger = logging.getLogger('appconfig-merger')
 
+# Shared AppConfig client; boto3 is only imported when it is first needed so
+# --help and config validation errors don't pay its import cost
+_CLIENT = None
+
+# Name -> ID resolutions rarely change, and hosted configuration versions are
+# immutable, so both are remembered across runs
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'appconfig-merger')
+ID_CACHE_PATH = os.path.join(CACHE_DIR, 'ids.json')
+ID_CACHE_TTL_SECONDS = 3600
+VERSION_CACHE_DIR = os.path.join(CACHE_DIR, 'versions')
+
+def get_appconfig_client():
+    """Return the process-wide AppConfig client, creating it on first use"""
+    global _CLIENT
+    if _CLIENT is None:
+        import boto3
+        from botocore.config import Config
+        
+        # Tuned so every AppConfig call reuses pooled, kept-alive HTTPS connections
+        # instead of paying a fresh TLS handshake
+        config = Config(
+            max_pool_connections=25,
+            retries={'max_attempts': 5, 'mode': 'adaptive'},
+            tcp_keepalive=True,
+            connect_timeout=5,
+            read_timeout=30
+        )
+        _CLIENT = boto3.session.Session().client('appconfig', config=config)
+    return _CLIENT
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps_pretty(obj):
+    """Serialize to 2-space indented JSON as UTF-8 bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    # ensure_ascii=False matches orjson's raw UTF-8 output byte for byte
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def write_file_atomically(path, content, mode=None):
+    """Write bytes to path via a temp file and os.replace so readers never see a partial file"""
+    # Without an explicit mode, keep the mode of a file being replaced and otherwise
+    # give new files what open(path, 'w') would: 0o666 minus the umask
+    if mode is None:
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+    
+    # A unique temp name in the same directory keeps concurrent writers apart and the rename atomic;
+    # this matters for the cache files, which concurrent builds on one agent share
+    directory, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory or '.', prefix=f"{name}.", suffix='.tmp')
+    try:
+        try:
+            # Write the whole buffer straight to the fd, bypassing Python's buffered writer
+            view = memoryview(content)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fchmod(fd, mode)
+            # Make sure the data is on disk before the rename makes it visible
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Merge AWS AppConfig feature flags with existing configuration')
     parser.add_argument('--config-file', required=True, help='Path to the feature flags JSON file')
@@ -24,46 +114,92 @@ def parse_arguments():
     parser.add_argument('--force-create', action='store_true', help='Force create new configuration if none exists')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
     parser.add_argument('--output-file', help='Path to write the merged configuration (defaults to same as input with .merged.json suffix)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached AppConfig IDs and configuration content')
     
     return parser.parse_args()
 
 def load_terraform_config(file_path):
     """Load the GitHub-defined configuration from a JSON file"""
     try:
-        with open(file_path, 'r') as f:
-            config = json.load(f)
+        with open(file_path, 'rb') as f:
+            config = json_loads(f.read())
         
-        # Validate the basic structure 
-        if not all(key in config for key in ["flags", "values"]):
-            logger.error(f"Config file {file_path} is missing required keys 'flags' and/or 'values'")
+        # Validate the basic structure up front so later code can index 'flags' and 'values' directly
+        if not isinstance(config, dict) or "flags" not in config or "values" not in config:
+            logger.error("Config file %s is missing required keys 'flags' and/or 'values'", file_path)
+            sys.exit(1)
+        
+        if not isinstance(config["flags"], dict) or not isinstance(config["values"], dict):
+            logger.error("Config file %s must define 'flags' and 'values' as JSON objects", file_path)
             sys.exit(1)
             
         return config
     except json.JSONDecodeError as e:
-        logger.error(f"Error parsing JSON file {file_path}: {str(e)}")
+        logger.error("Error parsing JSON file %s: %s", file_path, e)
         sys.exit(1)
     except FileNotFoundError:
-        logger.error(f"Config file {file_path} not found")
+        logger.error("Config file %s not found", file_path)
         sys.exit(1)
 
-def get_latest_configuration_version(client, app_id, profile_id):
+def version_cache_path(app_id, profile_id):
+    """Path of the cached content of a profile's latest hosted configuration version"""
+    return os.path.join(VERSION_CACHE_DIR, f"{app_id}-{profile_id}.json")
+
+def load_cached_version(app_id, profile_id, version_number):
+    """Return the cached configuration if it is for version_number, otherwise None"""
+    try:
+        with open(version_cache_path(app_id, profile_id), 'rb') as f:
+            cached = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version_number") != version_number:
+        return None
+    return cached.get("configuration")
+
+def save_cache_file(path, obj):
+    """Write obj as JSON to a private cache file; failures only cost a lookup or download next run"""
+    try:
+        # Cached content may include flag values such as allowed IDs, so keep it owner-only
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        write_file_atomically(path, json_dumps_pretty(obj), mode=0o600)
+    except OSError as e:
+        logger.debug("Could not write cache file %s: %s", path, e)
+
+def save_cached_version(app_id, profile_id, version_number, configuration):
+    """Cache a hosted configuration version's content"""
+    save_cache_file(
+        version_cache_path(app_id, profile_id),
+        {"version_number": version_number, "configuration": configuration}
+    )
+
+def get_latest_configuration_version(client, app_id, profile_id, use_cache=True):
     """Get the latest configuration version from the profile, regardless of deployment status"""
+    from botocore.exceptions import ClientError
+    
     try:
-        # List all versions for this profile
+        # Only the newest version is needed, so ask for a single-item page
         response = client.list_hosted_configuration_versions(
             ApplicationId=app_id,
-            ConfigurationProfileId=profile_id
+            ConfigurationProfileId=profile_id,
+            MaxResults=1
         )
         
         # If there are no versions, return None
         if not response.get('Items'):
-            logger.warning(f"No configuration versions found for profile ID: {profile_id}")
+            logger.warning("No configuration versions found for profile ID: %s", profile_id)
             return None, None
         
         # The versions are returned in descending order with the newest first
         latest_version = response['Items'][0]
         version_number = latest_version['VersionNumber']
         
+        # Hosted versions never change, so a cached copy of this version can be used as-is
+        configuration = load_cached_version(app_id, profile_id, version_number) if use_cache else None
+        if configuration is not None:
+            logger.info("Using cached content for configuration version: %s", version_number)
+            return configuration, version_number
+        
         # Now get the content of this version
         content_response = client.get_hosted_configuration_version(
             ApplicationId=app_id,
@@ -71,77 +207,134 @@ def get_latest_configuration_version(client, app_id, profile_id):
             VersionNumber=version_number
         )
         
-        # Decode the content from bytes to string, then parse JSON
-        content_bytes = content_response['Content']
-        content_string = content_bytes.read().decode('utf-8')
+        # Parse the raw bytes directly; json detects the UTF encoding itself
+        content_bytes = content_response['Content'].read()
         
         try:
-            configuration = json.loads(content_string)
-            logger.info(f"Retrieved latest configuration version: {version_number}")
+            configuration = json_loads(content_bytes)
+            logger.info("Retrieved latest configuration version: %s", version_number)
             
+            save_cached_version(app_id, profile_id, version_number, configuration)
             return configuration, version_number
         except json.JSONDecodeError as e:
-            logger.error(f"Error parsing configuration content: {str(e)}")
+            logger.error("Error parsing configuration content: %s", e)
             return None, None
             
     except ClientError as e:
-        logger.error(f"Error retrieving latest configuration version: {str(e)}")
+        # Let the caller tell stale IDs apart from other failures
+        if e.response['Error']['Code'] == 'ResourceNotFoundException':
+            raise
+        logger.error("Error retrieving latest configuration version: %s", e)
         return None, None
 
-def get_current_appconfig(client, application_name, environment_name, profile_name):
+def find_id_by_name(client, operation, name, **kwargs):
+    """Page through an AppConfig list_* operation and return the Id of the item called name"""
+    paginator = client.get_paginator(operation)
+    # AppConfig caps list_* pages at 50 items, so ask for the largest page allowed;
+    # pages are fetched lazily, so no further pages are requested once the name is found
+    pages = paginator.paginate(PaginationConfig={'PageSize': 50}, **kwargs)
+    return next((item['Id'] for page in pages for item in page['Items'] if item['Name'] == name), None)
+
+def load_id_cache():
+    """Load the on-disk cache of resolved AppConfig IDs; anything unusable counts as empty"""
+    try:
+        with open(ID_CACHE_PATH, 'rb') as f:
+            cache = json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_id_cache(cache):
+    """Persist the cache of resolved AppConfig IDs"""
+    save_cache_file(ID_CACHE_PATH, cache)
+
+def lookup_ids(client, application_name, environment_name, profile_name):
+    """Resolve application, environment and profile names to their IDs via the list_* APIs"""
+    # First, get the application ID
+    app_id = find_id_by_name(client, 'list_applications', application_name)
+    
+    if not app_id:
+        logger.warning("Application '%s' not found in AWS AppConfig", application_name)
+        return None
+    logger.info("Found application '%s' with ID: %s", application_name, app_id)
+    
+    # Environments and profiles only depend on the application ID, so look them up concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        env_future = executor.submit(find_id_by_name, client, 'list_environments', environment_name, ApplicationId=app_id)
+        profile_future = executor.submit(find_id_by_name, client, 'list_configuration_profiles', profile_name, ApplicationId=app_id)
+    
+    # Next, get the environment ID
+    env_id = env_future.result()
+    
+    if not env_id:
+        logger.warning("Environment '%s' not found in AWS AppConfig", environment_name)
+        return None
+    logger.info("Found environment '%s' with ID: %s", environment_name, env_id)
+    
+    # Then, get the configuration profile ID
+    profile_id = profile_future.result()
+    
+    if not profile_id:
+        logger.warning("Configuration profile '%s' not found in AWS AppConfig", profile_name)
+        return None
+    logger.info("Found configuration profile '%s' with ID: %s", profile_name, profile_id)
+    
+    return {"app_id": app_id, "env_id": env_id, "profile_id": profile_id}
+
+def get_current_appconfig(client, application_name, environment_name, profile_name, use_cache=True):
     """Get the current configuration from AWS AppConfig's configuration profile"""
+    from botocore.exceptions import ClientError
+    
     try:
-        # First, get the application ID
-        app_response = client.list_applications()
-        app_id = None
+        cache = load_id_cache() if use_cache else {}
+        cache_key = f"{client.meta.region_name}/{application_name}/{environment_name}/{profile_name}"
         
-        for app in app_response['Items']:
-            if app['Name'] == application_name:
-                app_id = app['Id']
-                logger.info(f"Found application '{application_name}' with ID: {app_id}")
-                break
+        cached_ids = cache.get(cache_key)
+        if cached_ids is not None and not (
+            isinstance(cached_ids, dict) and cached_ids.get("app_id") and cached_ids.get("profile_id")
+        ):
+            logger.info("Ignoring malformed cached AppConfig IDs: %s", cached_ids)
+            cached_ids = None
         
-        if not app_id:
-            logger.warning(f"Application '{application_name}' not found in AWS AppConfig")
-            return None, None
+        resolved_at = cached_ids.get("resolved_at") if cached_ids else None
+        if cached_ids and not (
+            isinstance(resolved_at, (int, float)) and time.time() - resolved_at <= ID_CACHE_TTL_SECONDS
+        ):
+            logger.info("Cached AppConfig IDs have expired, resolving names again")
+            cached_ids = None
         
-        # Next, get the environment ID
-        env_response = client.list_environments(ApplicationId=app_id)
-        env_id = None
-        
-        for env in env_response['Items']:
-            if env['Name'] == environment_name:
-                env_id = env['Id']
-                logger.info(f"Found environment '{environment_name}' with ID: {env_id}")
-                break
+        if cached_ids:
+            logger.info("Using cached AppConfig IDs: %s", cached_ids)
+            try:
+                return get_latest_configuration_version(
+                    client, cached_ids["app_id"], cached_ids["profile_id"], use_cache
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                    raise
+            
+            # The cached IDs are stale (e.g. the resources were recreated), so resolve them again
+            logger.info("Cached AppConfig IDs no longer exist, resolving names again")
+            del cache[cache_key]
+            save_id_cache(cache)
         
-        if not env_id:
-            logger.warning(f"Environment '{environment_name}' not found in AWS AppConfig")
+        ids = lookup_ids(client, application_name, environment_name, profile_name)
+        if not ids:
             return None, None
         
-        # Then, get the configuration profile ID
-        profile_response = client.list_configuration_profiles(ApplicationId=app_id)
-        profile_id = None
-        
-        for profile in profile_response['Items']:
-            if profile['Name'] == profile_name:
-                profile_id = profile['Id']
-                logger.info(f"Found configuration profile '{profile_name}' with ID: {profile_id}")
-                break
-        
-        if not profile_id:
-            logger.warning(f"Configuration profile '{profile_name}' not found in AWS AppConfig")
-            return None, None
+        if use_cache:
+            cache[cache_key] = dict(ids, resolved_at=time.time())
+            save_id_cache(cache)
         
         # Get the latest configuration version
-        return get_latest_configuration_version(client, app_id, profile_id)
+        return get_latest_configuration_version(client, ids["app_id"], ids["profile_id"], use_cache)
             
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceNotFoundException':
             logger.warning("No existing configuration found")
             return None, None
         else:
-            logger.error(f"Error retrieving current configuration: {str(e)}")
+            logger.error("Error retrieving current configuration: %s", e)
             return None, None
 
 def create_merged_config(github_config, aws_config, current_version):
@@ -151,148 +344,206 @@ def create_merged_config(github_config, aws_config, current_version):
         logger.info("No existing configuration found in AWS, using GitHub configuration as-is")
         return github_config
     
+    # Resolve the flag and value maps once up front
+    gh_flags = github_config["flags"]
+    gh_vals = github_config["values"]
+    aws_flags = aws_config.get("flags", {})
+    aws_vals = aws_config.get("values", {})
+    
     # Start with a new configuration object with the flags defined in GitHub
     merged_config = {
-        "flags": github_config["flags"].copy(),
+        "flags": gh_flags,
         "values": {},
         "version": "1"  # AWS AppConfig Feature Flags requires version as a string
     }
-    logger.info(f"merged_config-1: {merged_config}")
-    
-    # Track changes for logging
-    added_flags = set(github_config["flags"].keys()) - set(aws_config.get("flags", {}).keys())
-    removed_flags = set(aws_config.get("flags", {}).keys()) - set(github_config["flags"].keys())
-    preserved_flags = []
-    
-    # For each flag in GitHub (these are the flags we want to keep)
-    for flag_name in github_config["flags"].keys():
-        if flag_name in aws_config.get("values", {}):
-            # If flag exists in AWS AppConfig, preserve ALL its values and metadata
-            logger.info(f"Preserving existing values and metadata for flag: {flag_name}")
-            merged_config["values"][flag_name] = aws_config["values"][flag_name].copy()
-            preserved_flags.append(flag_name)
-        else:
-            # For new flags not in AWS AppConfig, use default values from GitHub
-            logger.info(f"Adding new flag with default values: {flag_name}")
-            merged_config["values"][flag_name] = github_config["values"].get(flag_name, {"enabled": "false"}).copy()
-
-
-    logger.info(f"merged_config-2: {merged_config}")
+    
+    # Track changes for logging (dict key views support set arithmetic directly)
+    added_flags = gh_flags.keys() - aws_flags.keys()
+    removed_flags = aws_flags.keys() - gh_flags.keys()
+    
+    # For each flag in GitHub (these are the flags we want to keep), preserve ALL
+    # existing AWS AppConfig values and metadata, otherwise fall back to the GitHub defaults
+    merged_config["values"] = {
+        flag_name: aws_vals[flag_name] if flag_name in aws_vals else gh_vals.get(flag_name, {"enabled": "false"})
+        for flag_name in gh_flags
+    }
+    preserved_flags = [flag_name for flag_name in gh_flags if flag_name in aws_vals]
+    defaulted_flags = [flag_name for flag_name in gh_flags if flag_name not in aws_vals]
     
     # Copy any top-level metadata fields from AWS AppConfig
-    for key in aws_config:
-        if key.startswith('_') and key not in merged_config:
-            logger.info(f"Preserving top-level metadata field: {key}")
-            merged_config[key] = aws_config[key]
+    meta_keys = [key for key in aws_config if key[:1] == '_' and key not in merged_config]
+    for key in meta_keys:
+        logger.debug("Preserving top-level metadata field: %s", key)
+        merged_config[key] = aws_config[key]
     
     # Display detailed log of changes
     if added_flags:
-        logger.info(f"Adding flags: {added_flags}")
+        logger.info("Adding flags: %s", added_flags)
     
     if removed_flags:
-        logger.info(f"Removing flags: {removed_flags}")
+        logger.info("Removing flags: %s", removed_flags)
     
     if preserved_flags:
-        logger.info(f"Preserving existing values for flags: {preserved_flags}")
+        logger.info("Preserving existing values for flags: %s", preserved_flags)
     
-    # Update the version field
-    logger.info(f"Configuration version updated from {current_version} to \"1\" (AWS requires version as a string value)")
+    if defaulted_flags:
+        logger.info("Using GitHub default values for flags: %s", defaulted_flags)
     
-    logger.info(f"merged_config-3: {merged_config}")
+    logger.info("Preserved values for %d flags, used GitHub defaults for %d flags", len(preserved_flags), len(defaulted_flags))
+    
+    # Update the version field
+    logger.info("Configuration version updated from %s to \"1\" (AWS requires version as a string value)", current_version)
     
     # Perform a final validation check
     if len(merged_config["flags"]) != len(merged_config["values"]):
-        logger.error(f"Configuration mismatch: {len(merged_config['flags'])} flags defined but {len(merged_config['values'])} value sets")
-        logger.error(f"Flags defined: {list(merged_config['flags'].keys())}")
-        logger.error(f"Values defined: {list(merged_config['values'].keys())}")
+        logger.error("Configuration mismatch: %d flags defined but %d value sets", len(merged_config['flags']), len(merged_config['values']))
+        logger.error("Flags defined: %s", list(merged_config['flags'].keys()))
+        logger.error("Values defined: %s", list(merged_config['values'].keys()))
         
         # Find the differences
-        missing_values = set(merged_config["flags"].keys()) - set(merged_config["values"].keys())
-        extra_values = set(merged_config["values"].keys()) - set(merged_config["flags"].keys())
+        missing_values = merged_config["flags"].keys() - merged_config["values"].keys()
+        extra_values = merged_config["values"].keys() - merged_config["flags"].keys()
         
         if missing_values:
-            logger.error(f"Flags missing values: {missing_values}")
+            logger.error("Flags missing values: %s", missing_values)
         if extra_values:
-            logger.error(f"Values without flag definitions: {extra_values}")
+            logger.error("Values without flag definitions: %s", extra_values)
         
         sys.exit(1)
     
     return merged_config
 
-def check_if_file_changed(output_path, merged_config):
+def digest_path(output_path):
+    """Path of the sidecar file holding the digest of the last written output"""
+    return f"{output_path}.digest"
+
+def content_digest(content):
+    """Hex digest used to recognise previously written output (BLAKE2b is cheaper than SHA-256)"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+def sidecar_matches(output_path, serialized):
+    """Check whether the sidecar digest proves the output file already holds serialized"""
+    sidecar = digest_path(output_path)
+    try:
+        output_stat = os.stat(output_path)
+        sidecar_stat = os.stat(sidecar)
+        # The sidecar is written after the output, so a newer output means it was edited since
+        if output_stat.st_size != len(serialized) or output_stat.st_mtime_ns > sidecar_stat.st_mtime_ns:
+            return False
+        with open(sidecar, 'r') as f:
+            return f.read().strip() == content_digest(serialized)
+    except OSError:
+        return False
+
+def check_if_file_changed(output_path, merged_config, serialized):
     """Check if the output file exists and is different from the merged config"""
     if not os.path.exists(output_path):
-        logger.info(f"Output file {output_path} doesn't exist yet")
+        logger.info("Output file %s doesn't exist yet", output_path)
         return True
         
     try:
-        with open(output_path, 'r') as f:
-            existing_content = json.load(f)
+        # Fastest path: the sidecar digest says the file is current, so don't even read it
+        if sidecar_matches(output_path, serialized):
+            logger.info("Output file matches the recorded digest of the merged configuration")
+            return False
+        
+        with open(output_path, 'rb') as f:
+            existing_bytes = f.read()
+        
+        # Fast path: a byte-identical file needs no parsing at all
+        if existing_bytes == serialized:
+            logger.info("Output file is identical to the merged configuration")
+            return False
+        
+        existing_content = json_loads(existing_bytes)
             
         # Compare only the structure (flags and their attributes)
         # without comparing values or metadata
-        existing_flags = set(existing_content.get("flags", {}).keys())
-        merged_flags = set(merged_config.get("flags", {}).keys())
+        existing_flags = existing_content.get("flags", {})
+        merged_flags = merged_config.get("flags", {})
         
-        if existing_flags != merged_flags:
-            logger.info(f"Flag sets are different: existing={existing_flags}, merged={merged_flags}")
+        # Dict key views compare like sets, so no temporary sets are needed
+        if existing_flags.keys() != merged_flags.keys():
+            logger.info("Flag sets are different: existing=%s, merged=%s", set(existing_flags), set(merged_flags))
             return True
             
-        # More detailed check for flag attributes
-        for flag_name in merged_flags:
-            if flag_name not in existing_content.get("flags", {}):
-                logger.info(f"Flag {flag_name} exists in merged but not in existing")
-                return True
-                
-            merged_attrs = merged_config["flags"][flag_name].get("attributes", {})
-            existing_attrs = existing_content["flags"][flag_name].get("attributes", {})
+        # More detailed check for flag attributes (both sides now hold the same flag names)
+        for flag_name, merged_flag in merged_flags.items():
+            merged_attrs = merged_flag.get("attributes", {})
+            existing_attrs = existing_flags[flag_name].get("attributes", {})
             
-            if set(merged_attrs.keys()) != set(existing_attrs.keys()):
-                logger.info(f"Attributes for flag {flag_name} are different")
+            if merged_attrs.keys() != existing_attrs.keys():
+                logger.info("Attributes for flag %s are different", flag_name)
                 return True
         
         logger.info("No structural changes detected in configuration")
         return False
     except Exception as e:
-        logger.warning(f"Error checking existing file: {str(e)}")
+        logger.warning("Error checking existing file: %s", e)
         return True
 
 def write_output_file(content, output_path):
-    """Write merged configuration to output file"""
+    """Write already-serialized merged configuration to output file"""
     try:
         # Create directory if it doesn't exist
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
             
-        with open(output_path, 'w') as f:
-            json.dump(content, f, indent=2)
+        # Swap the new content in atomically so a crash never leaves a truncated output file
+        write_file_atomically(output_path, content)
+        
+        # Record what was written so the next run can skip reading the file back
+        try:
+            with open(digest_path(output_path), 'w') as f:
+                f.write(content_digest(content))
+        except OSError as e:
+            logger.warning("Could not write digest file for %s: %s", output_path, e)
             
-        logger.info(f"Successfully wrote merged configuration to: {output_path}")
+        logger.info("Successfully wrote merged configuration to: %s", output_path)
         return True
     except Exception as e:
-        logger.error(f"Error writing output file: {str(e)}")
+        logger.error("Error writing output file: %s", e)
         return False
 
 def main():
     args = parse_arguments()
     
+    # While merging, hand records to a queue so the stderr writes happen on a background
+    # listener thread instead of blocking on a slow CI pipe. Stopping the listener in the
+    # finally block flushes every queued record before any traceback or exit.
+    root_logger = logging.getLogger()
+    stream_handlers = root_logger.handlers[:]
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *stream_handlers)
+    root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    try:
+        run_merge(args)
+    finally:
+        listener.stop()
+        root_logger.handlers = stream_handlers
+
+def run_merge(args):
+    """Merge the GitHub-defined flags with AWS AppConfig and write the result"""
     if args.debug:
         logger.setLevel(logging.DEBUG)
     
-    logger.info(f"Processing configuration file: {args.config_file}")
-    logger.info(f"Using AppConfig application: {args.app_name}")
-    logger.info(f"Using AppConfig environment: {args.env_name}")
-    logger.info(f"Using AppConfig profile: {args.profile_name}")
+    logger.info("Processing configuration file: %s", args.config_file)
+    logger.info("Using AppConfig application: %s", args.app_name)
+    logger.info("Using AppConfig environment: %s", args.env_name)
+    logger.info("Using AppConfig profile: %s", args.profile_name)
     
     # Load the GitHub-defined configuration
     github_config = load_terraform_config(args.config_file)
     
     # Initialize the AWS AppConfig client
-    client = boto3.client('appconfig')
+    client = get_appconfig_client()
     
     # Get the current configuration from AWS AppConfig
-    aws_config, current_version = get_current_appconfig(client, args.app_name, args.env_name, args.profile_name)
+    aws_config, current_version = get_current_appconfig(
+        client, args.app_name, args.env_name, args.profile_name, use_cache=not args.no_cache
+    )
     
     if not aws_config and not args.force_create:
         logger.error("No existing configuration found in AWS AppConfig and --force-create not specified")
@@ -308,18 +559,26 @@ def main():
     else:
         output_path = f"{args.config_file}.merged.json"
     
+    # Serialize once and reuse the text for both the file and the log
+    serialized = json_dumps_pretty(merged_config)
+    
     # Check if the file has actually changed
-    if check_if_file_changed(output_path, merged_config):
+    if check_if_file_changed(output_path, merged_config, serialized):
         logger.info("Writing updated merged configuration")
-        if not write_output_file(merged_config, output_path):
+        if not write_output_file(serialized, output_path):
             sys.exit(1)
     else:
-        logger.info(f"No structural changes detected. Keeping existing file: {output_path}")
+        logger.info("No structural changes detected. Keeping existing file: %s", output_path)
+    
+    logger.info(
+        "Merged configuration: %d flags, %d values, version=%s",
+        len(merged_config["flags"]), len(merged_config["values"]), merged_config.get("version")
+    )
     
-    # Output the merged configuration to logs for debugging
-    logger.info("Merged configuration content:")
-    with open(output_path, 'r') as f:
-        logger.info(f.read())
+    # Output the merged configuration to logs for debugging (only decoded when --debug is on)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Merged configuration content:")
+        logger.debug(serialized.decode('utf-8'))
     
     # Exit with success
     sys.exit(0)